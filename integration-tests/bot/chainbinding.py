@@ -52,13 +52,18 @@ class RpcBinding:
         self._p = ctypes.c_void_p()
         retcode = create_jsonrpc(ctypes.byref(self._p), storage.encode(), tendermint_ws.encode(), network_id, None)
         assert retcode == 0, 'create jsonrpc failed'
+        # response buffer reused across calls, the binding is used from a
+        # single thread so one buffer per instance is enough
+        self._buf = ctypes.create_string_buffer(102400)
 
     def __del__(self):
         dll.cro_destroy_jsonrpc(self._p)
 
     def call(self, req):
-        rsp = ctypes.create_string_buffer(102400)
-        retcode = dll.cro_run_jsonrpc(self._p, req.encode(), rsp, len(rsp), None)
+        if isinstance(req, str):
+            req = req.encode()
+        rsp = self._buf
+        retcode = dll.cro_run_jsonrpc(self._p, req, rsp, len(rsp), None)
         assert retcode == 0, rsp.value
         return rsp.value
 
@@ -1,19 +1,40 @@
 #!/usr/bin/env python3
 import os
 import getpass
+import itertools
 import logging
 import base64
 import binascii
 import json
 import subprocess
 import tempfile
+import threading
+import time
+from functools import lru_cache
 
 
-from jsonrpcclient import request
+import http.client
 from decouple import config
 
 from chainbinding import RpcBinding
 
+try:
+    # much faster (de)serialization for the rpc hot path
+    import orjson
+
+    def json_dumps(obj):
+        return orjson.dumps(obj).decode()
+
+    json_dumps_bytes = orjson.dumps
+    json_loads = orjson.loads
+except ImportError:
+    json_dumps = json.dumps
+
+    def json_dumps_bytes(obj):
+        return json.dumps(obj).encode()
+
+    json_loads = json.loads
+
 DEBUG_LEVEL = config('HTTP_DEBUG_LEVEL', 0, cast=int)
 if DEBUG_LEVEL:
     try:
@@ -30,6 +51,8 @@ if DEBUG_LEVEL:
     requests_log.propagate = True
 
 DEFAULT_WALLET = config('DEFAULT_WALLET', 'Default')
+TENDERMINT_RPC_PORT = config('TENDERMINT_RPC_PORT', 26657, cast=int)
+MOCK_MODE = config('BUILD_MODE', 'sgx') == 'mock'
 CARGO_TARGET_DIR = config('CARGO_TARGET_DIR', '../target')
 MLS_ENCLAVE_PATH = config(
     'MLS_ENCLAVE_PATH',
@@ -38,6 +61,7 @@ MLS_ENCLAVE_PATH = config(
 )
 
 
+@lru_cache(maxsize=None)
 def get_passphrase():
     phrase = config('PASSPHRASE', None)
     if phrase is None:
@@ -45,6 +69,7 @@ def get_passphrase():
     return phrase
 
 
+@lru_cache(maxsize=None)
 def get_enckey():
     key = config('ENCKEY', None)
     if key is None:
@@ -90,13 +115,13 @@ class Client:
         return self._binding
 
     def call(self, method, *args, **kwargs):
-        params = None
-        if args and kwargs:
-            params = list(args)
-            params.append(kwargs)
+        # common case first: positional params only
+        if not kwargs:
+            params = list(args) or None
         elif args:
             params = list(args)
-        elif kwargs:
+            params.append(kwargs)
+        else:
             params = kwargs
         req = {
             'jsonrpc': '2.0',
@@ -104,10 +129,40 @@ class Client:
             'method': method,
             'params': params
         }
-        rsp = json.loads(self.binding.call(json.dumps(req)))
+        rsp = json_loads(self.binding.call(json_dumps_bytes(req)))
         assert 'result' in rsp, rsp['error']
         return rsp['result']
 
+    def batch(self, calls):
+        '''execute multiple wallet rpc calls in one binding round trip
+        :param calls: list of (method, params) pairs
+        :return: list of results, in the same order as calls'''
+        reqs = [
+            {'jsonrpc': '2.0', 'id': i, 'method': method, 'params': params}
+            for i, (method, params) in enumerate(calls)
+        ]
+        rsps = json_loads(self.binding.call(json_dumps_bytes(reqs)))
+        results = [None] * len(reqs)
+        for rsp in rsps:
+            assert 'result' in rsp, rsp.get('error')
+            results[rsp['id']] = rsp['result']
+        return results
+
+
+# address type -> rpc method, precomputed dispatch tables
+ADDRESS_LIST_RPC = {
+    'staking': 'wallet_listStakingAddresses',
+    'transfer': 'wallet_listTransferAddresses',
+}
+ADDRESS_CREATE_RPC = {
+    'staking': 'wallet_createStakingAddress',
+    'transfer': 'wallet_createTransferAddress',
+}
+ADDRESS_CREATE_WATCH_RPC = {
+    'staking': 'wallet_createWatchStakingAddress',
+    'transfer': 'wallet_createWatchTransferAddress',
+}
+
 
 class Address:
     def __init__(self, client):
@@ -117,32 +172,36 @@ class Address:
         '''list addresses
         :param name: Name of the wallet. [default: Default]
         :params type: [staking|transfer]'''
-        return self.client.call('wallet_listStakingAddresses' if type == 'staking' else 'wallet_listTransferAddresses', [name, enckey or get_enckey()])
+        method = ADDRESS_LIST_RPC.get(type.lower())
+        assert method, 'invalid type'
+        return self.client.call(method, [name, enckey or get_enckey()])
+
+    def list_all(self, name=DEFAULT_WALLET, enckey=None):
+        '''list staking and transfer addresses in one rpc round trip
+        :param name: Name of the wallet. [default: Default]
+        :return: (staking addresses, transfer addresses)'''
+        enckey = enckey or get_enckey()
+        return self.client.batch([
+            ('wallet_listStakingAddresses', [[name, enckey]]),
+            ('wallet_listTransferAddresses', [[name, enckey]]),
+        ])
 
     def create(self, name=DEFAULT_WALLET, type='staking', enckey=None):
         '''Create address
         :param name: Name of the wallet
         :param type: Type of address. [staking|transfer]'''
-        type = type.lower()
-        assert type in ('staking', 'transfer'), 'invalid type'
-        return self.client.call(
-            'wallet_createStakingAddress'
-            if type == 'staking'
-            else 'wallet_createTransferAddress',
-            [name, enckey or get_enckey()])
+        method = ADDRESS_CREATE_RPC.get(type.lower())
+        assert method, 'invalid type'
+        return self.client.call(method, [name, enckey or get_enckey()])
 
     def create_watch(self, public_key, name=DEFAULT_WALLET, type='staking', enckey=None):
         '''Create watch address for watch only wallet
         :param name: Name of the wallet
         :param type: Type of address. [staking|transfer]
         :param public_key: Public key of the address'''
-        type = type.lower()
-        assert type in ('staking', 'transfer'), 'invalid type'
-        return self.client.call(
-            'wallet_createWatchStakingAddress'
-            if type == 'staking'
-            else 'wallet_createWatchTransferAddress',
-            [name, enckey or get_enckey()], public_key)
+        method = ADDRESS_CREATE_WATCH_RPC.get(type.lower())
+        assert method, 'invalid type'
+        return self.client.call(method, [name, enckey or get_enckey()], public_key)
 
 
 class Wallet:
@@ -336,22 +395,141 @@ class MultiSig:
             unsigned_transaction)
 
 
+_POST_HEADERS = {
+    'Content-Type': 'application/json',
+    'Connection': 'keep-alive',
+}
+
+
+class HTTPClient:
+    '''minimal persistent http transport for the localhost rpc endpoint,
+    keeps one keep-alive connection per thread and skips the per-request
+    overhead (proxy lookups, pooling locks) of the requests/urllib3 stack;
+    concurrent callers get parallel connections instead of sharing one'''
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self._local = threading.local()
+
+    @property
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = http.client.HTTPConnection(self.host, self.port)
+        return conn
+
+    def connect(self):
+        self._conn.connect()
+
+    def post(self, body):
+        conn = self._conn
+        try:
+            return self._post(conn, body)
+        except (http.client.NotConnected, http.client.BadStatusLine,
+                BrokenPipeError, ConnectionResetError):
+            # server closed the idle keep-alive connection, retry once
+            conn.close()
+            return self._post(conn, body)
+
+    def _post(self, conn, body):
+        conn.request('POST', '/', body, _POST_HEADERS)
+        rsp = conn.getresponse()
+        data = rsp.read()
+        assert rsp.status == 200, (rsp.status, data)
+        return data
+
+
 class Blockchain:
     def __init__(self, tendermint_port):
         self.tendermint_http = 'http://127.0.0.1:%d' % tendermint_port
+        self.tendermint_ws = 'ws://127.0.0.1:%d/websocket' % tendermint_port
+        self._http = HTTPClient('127.0.0.1', tendermint_port)
+        self._id = itertools.count()
+        self._immutable_cache = {}
+        self._status_cache = (0.0, None)
+
+    def connect(self):
+        'open the http connection up front so the first call is a single RTT'
+        self._http.connect()
 
     def call_chain(self, method, *args, **kwargs):
-        rsp = request(self.tendermint_http, method, *args, **kwargs)
-        return rsp.data.result
+        req = {
+            'jsonrpc': '2.0',
+            'id': next(self._id),
+            'method': method,
+            'params': kwargs if kwargs else list(args),
+        }
+        rsp = json_loads(self._http.post(json_dumps_bytes(req)))
+        assert 'result' in rsp, rsp.get('error')
+        return rsp['result']
 
-    def status(self):
-        return self.call_chain('status')
+    def call_chain_batch(self, calls):
+        '''execute multiple rpc calls in one http round trip
+        :param calls: list of (method, params) pairs
+        :return: list of results, in the same order as calls'''
+        reqs = [
+            {'jsonrpc': '2.0', 'id': i, 'method': method, 'params': params}
+            for i, (method, params) in enumerate(calls)
+        ]
+        rsps = json_loads(self._http.post(json_dumps_bytes(reqs)))
+        results = [None] * len(reqs)
+        for rsp in rsps:
+            assert 'result' in rsp, rsp.get('error')
+            results[rsp['id']] = rsp['result']
+        return results
+
+    def call_chain_cached(self, method, *args):
+        '''like call_chain, but memoize the result; only for reads that can
+        never change (genesis, queries at a fixed historical height)'''
+        key = (method,) + args
+        result = self._immutable_cache.get(key)
+        if result is None:
+            result = self._immutable_cache[key] = self.call_chain(method, *args)
+        return result
+
+    def new_blocks(self):
+        '''subscribe to NewBlock events over the tendermint websocket,
+        yields block headers as they are committed'''
+        import websocket
+        ws = websocket.create_connection(self.tendermint_ws)
+        try:
+            ws.send(json_dumps({
+                'jsonrpc': '2.0',
+                'id': next(self._id),
+                'method': 'subscribe',
+                'params': {'query': "tm.event='NewBlock'"},
+            }))
+            ws.recv()  # subscription ack
+            while True:
+                rsp = json_loads(ws.recv())
+                assert 'result' in rsp, rsp.get('error')
+                yield rsp['result']['data']['value']['block']['header']
+        finally:
+            ws.close()
+
+    def status(self, max_age=0):
+        '''fetch node status
+        :param max_age: reuse a status fetched within this many seconds,
+        for callers that read several fields in quick succession'''
+        fetched_at, status = self._status_cache
+        if status is not None and time.monotonic() - fetched_at < max_age:
+            return status
+        status = self.call_chain('status')
+        self._status_cache = (time.monotonic(), status)
+        return status
+
+    def status_and_validators(self):
+        'fetch status and current validators in one round trip'
+        return self.call_chain_batch([
+            ('status', []),
+            ('validators', [None, '0', '100']),
+        ])
 
     def info(self):
         return self.call_chain('info')
 
     def genesis(self):
-        return self.call_chain('genesis')
+        return self.call_chain_cached('genesis')
 
     def unconfirmed_txs(self):
         return self.call_chain('unconfirmed_txs')
@@ -360,22 +538,33 @@ class Blockchain:
         return self.status()['sync_info']['latest_block_height']
 
     def validators(self, height=None, page=0, num_per_page=100):
-        return self.call_chain('validators', str(height) if height is not None else None, str(page), str(num_per_page))
+        if height is not None:
+            return self.call_chain_cached('validators', str(height), str(page), str(num_per_page))
+        return self.call_chain('validators', None, str(page), str(num_per_page))
 
     def block(self, height='latest'):
-        height = height if height != 'latest' else self.latest_height()
-        return self.call_chain('block', str(height))
+        # a null height makes tendermint return the latest block,
+        # saving the extra status round trip
+        if height == 'latest':
+            return self.call_chain('block', None)
+        return self.call_chain_cached('block', str(height))
 
     def block_results(self, height='latest'):
-        height = height if height != 'latest' else self.latest_height()
-        return self.call_chain('block_results', str(height))
+        if height == 'latest':
+            return self.call_chain('block_results', None)
+        return self.call_chain_cached('block_results', str(height))
 
     def chain(self, min_height, max_height='latest'):
-        max_height = max_height if max_height != 'latest' else self.latest_height()
+        # maxHeight=0 means latest on the blockchain endpoint
+        max_height = max_height if max_height != 'latest' else 0
         return self.call_chain('blockchain', str(min_height), str(max_height))
 
     def commit(self, height='latest'):
-        height = height if height != 'latest' else self.latest_height()
+        # not cacheable: the commit at the store tip is served from the
+        # node's seen commit and only becomes canonical once the next
+        # block lands
+        if height == 'latest':
+            return self.call_chain('commit', None)
         return self.call_chain('commit', str(height))
 
     def query(self, path, data=None, height=None, proof=False):
@@ -427,14 +616,78 @@ class Blockchain:
             return staking
 
 
+class AsyncBlockchain:
+    '''async variant of Blockchain for overlapping independent reads,
+    e.g. asyncio.gather(chain.status(), chain.validators())
+
+    use as an async context manager so the aiohttp session is created
+    and closed inside a running event loop'''
+    def __init__(self, tendermint_port):
+        self.tendermint_http = 'http://127.0.0.1:%d' % tendermint_port
+        self._session = None
+        self._id = itertools.count()
+
+    async def __aenter__(self):
+        import aiohttp
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=16, keepalive_timeout=75)
+        )
+        return self
+
+    async def __aexit__(self, *exc):
+        await self._session.close()
+
+    async def call_chain(self, method, *args, **kwargs):
+        req = {
+            'jsonrpc': '2.0',
+            'id': next(self._id),
+            'method': method,
+            'params': kwargs if kwargs else list(args),
+        }
+        async with self._session.post(self.tendermint_http, json=req) as rsp:
+            rsp = await rsp.json()
+        assert 'result' in rsp, rsp.get('error')
+        return rsp['result']
+
+    async def status(self):
+        return await self.call_chain('status')
+
+    async def genesis(self):
+        return await self.call_chain('genesis')
+
+    async def latest_height(self):
+        return (await self.status())['sync_info']['latest_block_height']
+
+    async def validators(self, height=None, page=0, num_per_page=100):
+        return await self.call_chain('validators', str(height) if height is not None else None, str(page), str(num_per_page))
+
+    async def block(self, height='latest'):
+        if height == 'latest':
+            return await self.call_chain('block', None)
+        return await self.call_chain('block', str(height))
+
+    async def block_results(self, height='latest'):
+        if height == 'latest':
+            return await self.call_chain('block_results', None)
+        return await self.call_chain('block_results', str(height))
+
+    async def tx_search(self, query, include_proof=False,
+                        page=1, per_page=100, order_by="asc"):
+        return await self.call_chain(
+            'tx_search', query=query, prove=include_proof,
+            page=str(page), per_page=str(per_page),
+            order_by=order_by
+        )
+
+
 class RPC:
     def __init__(self, wallet_directory=None, tendermint_rpc_port=None, network_id=0xab, mock_mode=None):
         if wallet_directory is None:
             wallet_directory = config('WALLET_DIRECTORY')
         if tendermint_rpc_port is None:
-            tendermint_rpc_port = config('TENDERMINT_RPC_PORT', 26657)
+            tendermint_rpc_port = TENDERMINT_RPC_PORT
         if mock_mode is None:
-            mock_mode = config('BUILD_MODE', 'sgx') == 'mock'
+            mock_mode = MOCK_MODE
         client = Client(tendermint_rpc_port, wallet_directory, network_id, mock_mode)
         self.wallet = Wallet(client)
         self.staking = Staking(client)
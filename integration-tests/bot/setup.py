@@ -14,7 +14,9 @@ setup(
         'fire==0.2.1',
         'mnemonic==0.19',
         'jsonpatch==1.24',
-        'jsonrpcclient[requests]',
+        'aiohttp',
+        'websocket_client',
+        'orjson',
         'scalecodec',
         'base58',
     ],
@@ -30,8 +30,9 @@ wait_for_validators(rpc, 1)
 
 enckey = rpc.wallet.enckey()
 os.environ['ENCKEY'] = enckey
-bonded_staking, unbonded_staking = rpc.address.list()[:2]
-transfer = rpc.address.list(type='transfer')[0]
+stakings, transfers = rpc.address.list_all()
+bonded_staking, unbonded_staking = stakings[:2]
+transfer = transfers[0]
 
 txid = rpc.staking.withdraw_all_unbonded(unbonded_staking, transfer)
 wait_for_tx(rpc, txid)
@@ -1,12 +1,19 @@
 import os
+import random
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import http.client
 import socket
 import xmlrpc.client
-import iso8601
 import weakref
 
+try:
+    # C implementation, much faster on the per-block parsing path
+    from ciso8601 import parse_datetime as parse_date
+except ImportError:
+    from iso8601 import parse_date
+
 
 def wait_for_port(port, host='127.0.0.1', timeout=40.0):
     start_time = time.perf_counter()
@@ -32,14 +39,32 @@ def wait_for_tx(rpc, txid, timeout=10):
 
 
 def wait_for_validators(rpc, count, timeout=10):
-    for i in range(timeout):
-        n = len(rpc.chain.validators()['validators'])
-        print('Checking validators', n)
+    deadline = time.perf_counter() + timeout
+    delay = 0.2
+    while True:
+        # batched into one round trip per poll
+        status, validators = rpc.chain.status_and_validators()
+        n = len(validators['validators'])
+        print('Checking validators', n,
+              'at height', status['sync_info']['latest_block_height'])
         if n >= count:
             break
-        time.sleep(1)
-    else:
-        raise TimeoutError('validators still not enough, giveup')
+        if time.perf_counter() >= deadline:
+            raise TimeoutError('validators still not enough, giveup')
+        # exponential backoff with jitter, capped at 2 seconds
+        time.sleep(min(delay * (0.5 + random.random()), 2.0))
+        delay *= 2
+
+
+def warm_up(rpcs):
+    '''create the wallet bindings of several rpc clients concurrently,
+    otherwise each one is paid serially on first wallet call; the http side
+    is already covered by the preconnect in get_rpc'''
+    def warm(rpc):
+        rpc.wallet.client.binding
+
+    with ThreadPoolExecutor(len(rpcs)) as executor:
+        list(executor.map(warm, rpcs))
 
 
 def latest_block_height(rpc):
@@ -47,10 +72,13 @@ def latest_block_height(rpc):
 
 
 def wait_for_blocks(rpc, n, height=None):
-    height = height if height is not None else latest_block_height(rpc)
-    while True:
-        time.sleep(1)
-        latest = latest_block_height(rpc)
+    latest = latest_block_height(rpc)
+    height = height if height is not None else latest
+    if latest - height >= n:
+        return latest
+    # wait for committed blocks instead of sleep-polling status
+    for header in rpc.chain.new_blocks():
+        latest = int(header['height'])
         if latest - height >= n:
             return latest
 
@@ -65,20 +93,23 @@ def latest_block_time(rpc):
 
 
 def latest_block(rpc):
-    sync_info = rpc.chain.status()['sync_info']
+    # a freshly cached status is fine here, block times are >= 1s anyway
+    sync_info = rpc.chain.status(max_age=0.5)['sync_info']
     return (
-        datetime.timestamp(iso8601.parse_date(sync_info['latest_block_time'])),
+        datetime.timestamp(parse_date(sync_info['latest_block_time'])),
         int(sync_info['latest_block_height'])
     )
 
 
 def wait_for_blocktime(rpc, t):
-    while True:
-        time.sleep(1)
-        block_time, block_height = latest_block(rpc)
+    block_time, block_height = latest_block(rpc)
+    if block_time > t:
+        return block_height
+    for header in rpc.chain.new_blocks():
+        block_time = datetime.timestamp(parse_date(header['time']))
         print('block_time:', block_time)
         if block_time > t:
-            return block_height
+            return int(header['height'])
 
 
 def wait_for_block_state(rpc, height):
@@ -109,6 +140,12 @@ def get_rpc(i=0):
             os.path.join(os.path.dirname(__file__), '../data/node%d/wallet' % i),
             base_port + 7
         )
+        try:
+            # preconnect so the first poll doesn't pay the handshake;
+            # best effort, the node may not be listening yet
+            rpc.chain.connect()
+        except OSError:
+            pass
         _rpc_cache[i] = rpc
     return rpc
 
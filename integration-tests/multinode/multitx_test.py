@@ -31,20 +31,21 @@ os.environ['ENCKEY'] = rpc.wallet.enckey()
 print('Prepare node0 transfer addresses')
 
 enckey = rpc.wallet.enckey()
-unbonded = rpc.address.list()[1]
-transfer1 = rpc.address.list(type='transfer')[0]
+stakings, transfers = rpc.address.list_all(enckey=enckey)
+unbonded = stakings[1]
+transfer1 = transfers[0]
 
 
 txid = rpc.staking.withdraw_all_unbonded(unbonded, transfer1, enckey=enckey)
 wait_for_tx(rpc, txid)
-rpc.wallet.sync()
+rpc.wallet.sync(enckey=enckey)
 
-addresses = [rpc.address.create(type='transfer') for i in range(10)]
+addresses = [rpc.address.create(type='transfer', enckey=enckey) for i in range(10)]
 amount = 100000000
 for addr in addresses:
-    txid = rpc.wallet.send(addr, amount)
+    txid = rpc.wallet.send(addr, amount, enckey=enckey)
     wait_for_tx(rpc, txid)
-    rpc.wallet.sync()
+    rpc.wallet.sync(enckey=enckey)
 
 print('Stop node1')
 stop_node(supervisor, 'node1')
@@ -52,7 +53,7 @@ stop_node(supervisor, 'node1')
 last_height = latest_block_height(rpc)
 
 print('Send multiple tx')
-pending_txs = [rpc.wallet.send(transfer1, amount) for _ in addresses]
+pending_txs = [rpc.wallet.send(transfer1, amount, enckey=enckey) for _ in addresses]
 time.sleep(1)  # Wait a little bit for the tx processing
 
 print('Start node1')
@@ -3,7 +3,7 @@ import os
 import math
 from common import (
     get_rpc, UnixStreamXMLRPCClient, wait_for_blocks, stop_node, wait_for_blocktime, wait_for_port,
-    latest_block_time, wait_for_block_state
+    latest_block_time, wait_for_block_state, warm_up
 )
 
 '''
@@ -33,6 +33,7 @@ wait_for_port(BASE_PORT + 20 + 7)
 
 rpc = get_rpc()
 rpc2 = get_rpc(2)
+warm_up([rpc, rpc2])
 init_bonded = 90000000000000000
 
 wait_for_blocks(rpc, 2, height=0)
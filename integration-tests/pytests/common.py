@@ -1,9 +1,14 @@
 import os
 from datetime import datetime
 import time
-import iso8601
 import weakref
 
+try:
+    # C implementation, much faster on the per-block parsing path
+    from ciso8601 import parse_datetime as parse_date
+except ImportError:
+    from iso8601 import parse_date
+
 
 def wait_for_tx(rpc, txid, timeout=10):
     for i in range(timeout):
@@ -19,7 +24,7 @@ def wait_for_blocktime(rpc, t):
     print('Wait for block time', t)
     while True:
         time.sleep(1)
-        block_time = datetime.timestamp(iso8601.parse_date(rpc.chain.status()['sync_info']['latest_block_time']))
+        block_time = datetime.timestamp(parse_date(rpc.chain.status()['sync_info']['latest_block_time']))
         print('block_time:', block_time)
         if block_time > t:
             break
@@ -37,5 +42,11 @@ def get_rpc(i=0):
             os.path.join(os.path.dirname(__file__), '../data/node%d/wallet' % i),
             base_port + 7
         )
+        try:
+            # preconnect so the first poll doesn't pay the handshake;
+            # best effort, the node may not be listening yet
+            rpc.chain.connect()
+        except OSError:
+            pass
         _rpc_cache[i] = rpc
     return rpc
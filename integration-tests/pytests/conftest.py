@@ -24,11 +24,12 @@ class TestAddresses:
 @pytest.fixture
 def addresses():
     rpc = get_rpc()
+    # resolve the enckey once and pass it explicitly below, so the polling
+    # loop doesn't re-resolve it on every call
     enckey = rpc.wallet.enckey()
     os.environ['ENCKEY'] = enckey
-    rpc.wallet.sync()
-    stakings = rpc.address.list(type='staking')
-    transfers = rpc.address.list(type='transfer')
+    rpc.wallet.sync(enckey=enckey)
+    stakings, transfers = rpc.address.list_all(enckey=enckey)
     addrs = TestAddresses(
         stakings[0], stakings[1],
         transfers[0], transfers[1],
@@ -38,19 +39,20 @@ def addresses():
     if int(state['unbonded']) > 0:
         rpc.staking.withdraw_all_unbonded(
             addrs.unbonded_staking,
-            addrs.transfer1
+            addrs.transfer1,
+            enckey=enckey
         )
         time.sleep(2)
-        rpc.wallet.sync()
-        balance = rpc.wallet.balance()
+        rpc.wallet.sync(enckey=enckey)
+        balance = rpc.wallet.balance(enckey=enckey)
         assert int(balance["total"]) > 0
     else:
-        balance = rpc.wallet.balance()
+        balance = rpc.wallet.balance(enckey=enckey)
     # wait for the pending amount become available
     loop = 0
     while int(balance["pending"]) != 0 and loop < 60:
-        rpc.wallet.sync()
-        balance = rpc.wallet.balance()
+        rpc.wallet.sync(enckey=enckey)
+        balance = rpc.wallet.balance(enckey=enckey)
         time.sleep(1)
         loop += 1
     assert int(balance["available"]) > 0